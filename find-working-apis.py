@@ -4,335 +4,571 @@ Find Working USPTO APIs Script - 2025
 Tests various endpoints and methods to find actually working USPTO data sources
 """
 
-import requests
+import argparse
+import asyncio
+import aiohttp
+import io
 import json
-from urllib3.exceptions import InsecureRequestWarning
+import orjson
+import re
+import shelve
 import time
-import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
+from collections import defaultdict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+from lxml import etree
+from multidict import CIMultiDict
+from typing import Any, Callable, Dict, List, Optional
 
-# Suppress SSL warnings for testing
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+try:
+    # aiohttp can only decode brotli bodies when a brotli binding is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Script lines that look like they reference a search/API endpoint
+_API_CLUE_RE = re.compile(r'^.*(?:/api/|search|query|patent).*$', re.IGNORECASE | re.MULTILINE)
+
+# Keywords that suggest a page offers bulk downloads, matched on raw bytes
+_BULK_RE = re.compile(rb'(bulk|download|xml|json|zip)', re.IGNORECASE)
+
+@dataclass(slots=True)
+class Probe:
+    """One endpoint to probe and how to judge its response
+
+    check(probe, status, headers, body) returns a dict of discoveries to merge
+    into working_apis; expand(probe, headers, body) returns follow-up probes to
+    run when the endpoint answers 200.
+    """
+    name: str
+    url: str
+    category: str
+    check: Optional[Callable[..., Dict[str, Any]]] = None
+    expand: Optional[Callable[..., List['Probe']]] = None
+    method: str = 'GET'
+    params: Optional[Dict[str, str]] = None
+    timeout: int = 10
+    max_bytes: Optional[int] = None
+    head_first: bool = False
+
+def slug(name):
+    return name.lower().replace(" ", "_")
+
+def _release(elem):
+    """Clear a closed element and detach the already-closed siblings before it
+
+    The root element has no parent; anything before it (comments, processing
+    instructions) is left alone.
+    """
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+def check_xml(body):
+    """Stream-parse an XML body, raising etree.XMLSyntaxError if it is malformed
+
+    Elements are dropped as soon as they close, so validation runs in flat
+    memory however large the feed is. Anything that consumes XML records
+    should follow the same iterparse/clear pattern rather than build a tree.
+    """
+    for _, elem in etree.iterparse(io.BytesIO(body), events=('end',), huge_tree=True):
+        _release(elem)
+
+def scan_html(body, chunk_size=65536):
+    """Collect script bodies and form actions from an HTML page in one streaming pass
+
+    Elements are cleared and detached as they close, so memory stays flat
+    however large the page is; no full DOM is ever held.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    scripts = []
+    actions = []
+
+    def drain():
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if elem.tag == 'form' and elem.get('action'):
+                    actions.append(elem.get('action'))
+            else:
+                if elem.tag == 'script' and elem.text:
+                    scripts.append(elem.text)
+                _release(elem)
+
+    for offset in range(0, len(body), chunk_size):
+        parser.feed(body[offset:offset + chunk_size])
+        drain()
+    parser.close()
+    drain()
+
+    return scripts, actions
+
+def check_google_search(probe, status, headers, body):
+    if status != 200:
+        return {}
+
+    print("✓ Google Patents is scrapable!")
+    return {
+        'google_patents_scraping': {
+            'status': 'working',
+            'type': 'scraping',
+            'url': probe.url,
+            'base_url': 'https://patents.google.com/',
+            'search_url': probe.url,
+            'note': 'Can scrape search results and individual patents'
+        }
+    }
+
+def check_bulk_data(probe, status, headers, body):
+    if status != 200:
+        return {}
+
+    hits = {match.group(1).lower() for match in _BULK_RE.finditer(body)}
+    if b'bulk' not in hits and b'download' not in hits:
+        return {}
+
+    print(f"✓ {probe.name} - Bulk data available")
+
+    # Check for specific file formats
+    if b'xml' in hits:
+        print(f"  - XML files available")
+    if b'json' in hits:
+        print(f"  - JSON files available")
+    if b'zip' in hits:
+        print(f"  - ZIP files available")
+
+    return {
+        f'bulk_{slug(probe.name)}': {
+            'status': 'working',
+            'type': 'bulk_download',
+            'url': probe.url,
+            'note': 'Bulk data files available for download'
+        }
+    }
+
+def check_alternative_source(probe, status, headers, body):
+    if status != 200:
+        return {}
+
+    print(f"✓ {probe.name} is accessible")
+    return {
+        f'alt_{slug(probe.name)}': {
+            'status': 'accessible',
+            'type': 'alternative_source',
+            'url': probe.url,
+            'note': 'Alternative patent/trademark data source'
+        }
+    }
+
+def check_xml_feed(probe, status, headers, body):
+    if status != 200:
+        return {}
+
+    try:
+        check_xml(body)
+    except etree.XMLSyntaxError:
+        if 'xml' in headers.get('content-type', '').lower():
+            print(f"~ {probe.name} - Claims to be XML but malformed")
+        else:
+            print(f"~ {probe.name} - Not XML format")
+        return {}
+
+    print(f"✓ {probe.name} - Valid XML response")
+    return {
+        f'xml_{slug(probe.name)}': {
+            'status': 'working',
+            'type': 'xml_api',
+            'url': probe.url,
+            'note': 'Returns valid XML data'
+        }
+    }
+
+def check_form_endpoint(probe, status, headers, body):
+    if status not in [200, 400, 405]:  # 400/405 might mean it expects POST
+        return {}
+
+    print(f"✓ Form endpoint responsive: {status}")
+    return {
+        f'search_form_{slug(probe.name)}': {
+            'status': 'responsive',
+            'type': 'search_endpoint',
+            'url': probe.url,
+            'note': f'Form endpoint, HTTP {status}'
+        }
+    }
+
+def expand_patent_public_search(probe, headers, body):
+    """Report API clues in the PPUBS page scripts and probe its form endpoints"""
+    # Redirect stubs, error pages and non-HTML bodies aren't worth parsing
+    content_type = headers.get('content-type', '')
+    if 'html' not in content_type or len(body) <= 512:
+        print(f"~ Skipping page analysis ({content_type or 'no content type'}, {len(body)} bytes)")
+        return []
+
+    scripts, form_actions = scan_html(body)
+
+    # Look for API endpoints in JavaScript
+    api_clues = [
+        line.strip() for line in _API_CLUE_RE.findall('\n'.join(scripts))
+        if 'http' in line or '/' in line
+    ]
+    if api_clues:
+        print("Found potential API endpoints:")
+        for clue in api_clues[:10]:  # Show first 10
+            print(f"  {clue}")
+
+    # Look for forms that might indicate search endpoints
+    follow_ups = []
+    for action in form_actions:
+        print(f"Form action found: {action}")
+        if action.startswith('/'):
+            full_url = f"https://ppubs.uspto.gov{action}"
+            print(f"Testing form endpoint: {full_url}")
+            follow_ups.append(Probe(action, full_url, 'search_form', check=check_form_endpoint, timeout=5))
+
+    return follow_ups
+
+def check_known_endpoint(probe, status, headers, body):
+    name = probe.name
+
+    if status == 200:
+        content_type = headers.get('content-type', '')
+        print(f"  Content-Type: {content_type}")
+
+        # Check if it looks like an API
+        if 'json' in content_type:
+            try:
+                json.loads(body)
+            except ValueError:
+                print(f"~ {name} - Claims JSON but invalid")
+                return {}
+
+            print(f"✓ {name} - Valid JSON API")
+            return {
+                f'api_{slug(name)}': {
+                    'status': 'working',
+                    'type': 'json_api',
+                    'url': probe.url,
+                    'note': 'Returns valid JSON'
+                }
+            }
+
+        if 'xml' in content_type:
+            print(f"✓ {name} - XML API")
+            return {
+                f'xml_api_{slug(name)}': {
+                    'status': 'working',
+                    'type': 'xml_api',
+                    'url': probe.url,
+                    'note': 'Returns XML data'
+                }
+            }
+
+        print(f"~ {name} - Web interface ({content_type})")
+        return {
+            f'web_{slug(name)}': {
+                'status': 'web_interface',
+                'type': 'html',
+                'url': probe.url,
+                'note': 'Web interface, may be scrapable'
+            }
+        }
+
+    if status in [401, 403]:
+        print(f"~ {name} - Requires authentication ({status})")
+        return {
+            f'auth_{slug(name)}': {
+                'status': 'requires_auth',
+                'type': 'api',
+                'url': probe.url,
+                'note': f'Requires authentication (HTTP {status})'
+            }
+        }
+
+    return {}
+
+# Every endpoint the discovery run looks at, in reporting order
+PROBES = [
+    # Google Patents scraping
+    Probe("Google Patents homepage", "https://patents.google.com/", 'google_patents', timeout=15),
+    Probe("Google Patents search", "https://patents.google.com/xhr/query", 'google_patents',
+          check=check_google_search,
+          params={'url': 'q=artificial+intelligence&num=2', 'exp': '', 'content': '1'}),
+
+    # USPTO bulk data; HEAD first and only scan the first 64KB of pages that answer
+    Probe("Open Data Portal", "https://data.uspto.gov/", 'bulk_data',
+          check=check_bulk_data, head_first=True, max_bytes=65536),
+    Probe("Bulk Data Products", "https://www.uspto.gov/learning-and-resources/bulk-data-products", 'bulk_data',
+          check=check_bulk_data, head_first=True, max_bytes=65536),
+    Probe("Patent Grant Full Text", "https://www.uspto.gov/patents/application-process/search-for-and-retrieve-patent-and-application-information", 'bulk_data',
+          check=check_bulk_data, head_first=True, max_bytes=65536),
+
+    # Alternative patent data sources, status only
+    Probe("Free Patents Online", "http://www.freepatentsonline.com/search.html", 'alternative',
+          check=check_alternative_source, method='HEAD'),
+    Probe("Patent Lens", "https://www.lens.org/lens/", 'alternative',
+          check=check_alternative_source, method='HEAD'),
+    Probe("WIPO Global Brand Database", "https://www3.wipo.int/branddb/en/", 'alternative',
+          check=check_alternative_source, method='HEAD'),
+
+    # USPTO XML feeds
+    Probe("Patent Grant Data", "https://www.uspto.gov/patents/apply/status/application-status-search", 'xml_feed',
+          check=check_xml_feed),
+    Probe("TSDR Status", "https://tsdrapi.uspto.gov/ts/cd/casestatus/sn88888888/info.xml", 'xml_feed',
+          check=check_xml_feed),
+    Probe("Assignment Data", "https://assignment-api.uspto.gov/patent/search?query=test&format=xml", 'xml_feed',
+          check=check_xml_feed),
+
+    # Patent Public Search, mined for hidden API and form endpoints
+    Probe("Patent Public Search main page", "https://ppubs.uspto.gov/pubwebapp/", 'patent_public_search',
+          expand=expand_patent_public_search, timeout=15),
+
+    # Known/documented endpoints
+    Probe("PatentsView Legacy", "https://api.patentsview.org/", 'known', check=check_known_endpoint),
+    Probe("PatentsView New", "https://search.patentsview.org/api/v1/", 'known', check=check_known_endpoint),
+    Probe("USPTO Developer Portal", "https://developer.uspto.gov/api-catalog", 'known', check=check_known_endpoint),
+    Probe("USPTO Open Data", "https://data.uspto.gov/api/", 'known', check=check_known_endpoint),
+    Probe("Patent Assignment Search", "https://assignment-api.uspto.gov/patent/search", 'known', check=check_known_endpoint),
+    Probe("TSDR Info", "https://tsdrapi.uspto.gov/ts/cd/casestatus/info", 'known', check=check_known_endpoint),
+    Probe("PAIR", "https://portal.uspto.gov/pair/", 'known', check=check_known_endpoint),
+]
 
 class USPTOAPIFinder:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.verify = False
-        self.session.headers.update({
+    # On-disk probe cache, reused across runs while responses are still fresh
+    CACHE_FILE = 'uspto_probes'
+    CACHE_TTL = 600
+    CACHEABLE_STATUSES = (200, 301, 302, 401, 403)
+
+    # Hard wall-clock limits (seconds) for a single probe and for the whole run
+    PROBE_TIMEOUT = 15
+    RUN_TIMEOUT = 30
+
+    def __init__(self, use_cache=True):
+        self.session = None
+        self.use_cache = use_cache
+        self.cache = None
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json, application/xml, text/html, */*',
             'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive'
-        })
+        }
         self.working_apis = {}
 
-    def test_google_patents_scraping(self):
-        """Test if we can scrape Google Patents"""
-        print("\n=== Testing Google Patents Scraping ===")
-        
-        try:
-            # Test basic search page
-            url = "https://patents.google.com/"
-            response = self.session.get(url, timeout=15)
-            print(f"Google Patents homepage: {response.status_code}")
-            
-            if response.status_code == 200:
-                # Try a search
-                search_url = "https://patents.google.com/xhr/query"
-                params = {
-                    'url': 'q=artificial+intelligence&num=2',
-                    'exp': '',
-                    'content': '1'
+        # Responses already fetched (or in flight) during this run, by request key
+        self._responses = {}
+
+        # Cap the number of probes in flight at once
+        self.semaphore = asyncio.Semaphore(64)
+
+    async def fetch(self, url, timeout=10, params=None, retries=3, method='GET', max_bytes=None):
+        """Request a URL and return (status, headers, body), backing off on 429/5xx
+
+        HEAD requests return an empty body; max_bytes stops reading a GET body
+        after that many bytes so large pages don't have to be downloaded in full.
+        Repeat requests within a run share one result, and fresh responses from
+        earlier runs are served from the on-disk cache.
+        """
+        key = f"{method} {url}?{urlencode(params or {})} {max_bytes}"
+        if key not in self._responses:
+            self._responses[key] = asyncio.ensure_future(
+                self._fetch(key, url, timeout, params, retries, method, max_bytes)
+            )
+
+        # Shielded so one caller timing out doesn't cancel the fetch for the others
+        return await asyncio.shield(self._responses[key])
+
+    async def _fetch(self, key, url, timeout, params, retries, method, max_bytes):
+        """Serve a request from the on-disk cache, or fetch and store it"""
+        if self.cache is not None:
+            entry = self.cache.get(key)
+            if entry and entry['expires_at'] > time.time():
+                return entry['status'], entry['headers'], entry['body']
+
+        status, headers, body = await self._request(url, timeout, params, retries, method, max_bytes)
+
+        if self.cache is not None and status in self.CACHEABLE_STATUSES:
+            ttl = self._freshness(headers)
+            if ttl > 0:
+                self.cache[key] = {
+                    'status': status,
+                    'headers': CIMultiDict(headers),
+                    'body': body,
+                    'fetched_at': time.time(),
+                    'expires_at': time.time() + ttl
                 }
-                
-                search_response = self.session.get(search_url, params=params, timeout=10)
-                print(f"Google Patents search: {search_response.status_code}")
-                
-                if search_response.status_code == 200:
-                    print("✓ Google Patents is scrapable!")
-                    self.working_apis['google_patents_scraping'] = {
-                        'status': 'working',
-                        'type': 'scraping',
-                        'base_url': 'https://patents.google.com/',
-                        'search_url': search_url,
-                        'note': 'Can scrape search results and individual patents'
-                    }
-        
-        except Exception as e:
-            print(f"Google Patents error: {e}")
-
-    def test_uspto_bulk_data(self):
-        """Test USPTO bulk data downloads"""
-        print("\n=== Testing USPTO Bulk Data Access ===")
-        
-        # Test various bulk data endpoints
-        bulk_endpoints = [
-            ("Open Data Portal", "https://data.uspto.gov/"),
-            ("Bulk Data Products", "https://www.uspto.gov/learning-and-resources/bulk-data-products"),
-            ("Patent Grant Full Text", "https://www.uspto.gov/patents/application-process/search-for-and-retrieve-patent-and-application-information"),
-        ]
-        
-        for name, url in bulk_endpoints:
-            try:
-                response = self.session.get(url, timeout=10)
-                print(f"{name}: {response.status_code}")
-                
-                if response.status_code == 200:
-                    if 'bulk' in response.text.lower() or 'download' in response.text.lower():
-                        print(f"✓ {name} - Bulk data available")
-                        
-                        # Check for specific file formats
-                        if 'xml' in response.text.lower():
-                            print(f"  - XML files available")
-                        if 'json' in response.text.lower():
-                            print(f"  - JSON files available")
-                        if 'zip' in response.text.lower():
-                            print(f"  - ZIP files available")
-                        
-                        self.working_apis[f'bulk_{name.lower().replace(" ", "_")}'] = {
-                            'status': 'working',
-                            'type': 'bulk_download',
-                            'url': url,
-                            'note': 'Bulk data files available for download'
-                        }
-            
-            except Exception as e:
-                print(f"{name} error: {e}")
-
-    def test_alternative_patent_sources(self):
-        """Test alternative patent data sources"""
-        print("\n=== Testing Alternative Patent Data Sources ===")
-        
-        # Test various alternative sources
-        alternatives = [
-            ("Free Patents Online", "http://www.freepatentsonline.com/search.html"),
-            ("Patent Lens", "https://www.lens.org/lens/"),
-            ("WIPO Global Brand Database", "https://www3.wipo.int/branddb/en/"),
-        ]
-        
-        for name, url in alternatives:
-            try:
-                response = self.session.get(url, timeout=10)
-                print(f"{name}: {response.status_code}")
-                
-                if response.status_code == 200:
-                    print(f"✓ {name} is accessible")
-                    self.working_apis[f'alt_{name.lower().replace(" ", "_")}'] = {
-                        'status': 'accessible',
-                        'type': 'alternative_source',
-                        'url': url,
-                        'note': 'Alternative patent/trademark data source'
-                    }
-                    
-            except Exception as e:
-                print(f"{name} error: {e}")
-
-    def test_uspto_xml_feeds(self):
-        """Test USPTO XML data feeds"""
-        print("\n=== Testing USPTO XML/RSS Feeds ===")
-        
-        # Test known XML endpoints
-        xml_endpoints = [
-            ("Patent Grant Data", "https://www.uspto.gov/patents/apply/status/application-status-search"),
-            ("TSDR Status", "https://tsdrapi.uspto.gov/ts/cd/casestatus/sn88888888/info.xml"),
-            ("Assignment Data", "https://assignment-api.uspto.gov/patent/search?query=test&format=xml"),
-        ]
-        
-        for name, url in xml_endpoints:
+
+        return status, headers, body
+
+    def _freshness(self, headers):
+        """Seconds a response may be reused for, from Cache-Control or Expires"""
+        cache_control = headers.get('cache-control', '').lower()
+        if 'no-store' in cache_control or 'no-cache' in cache_control:
+            return 0
+
+        max_age = re.search(r'max-age=(\d+)', cache_control)
+        if max_age:
+            return int(max_age.group(1))
+
+        expires = headers.get('expires')
+        if expires:
             try:
-                response = self.session.get(url, timeout=10)
-                print(f"{name}: {response.status_code}")
-                
-                # Check if it's valid XML
-                if response.status_code == 200:
-                    try:
-                        # Try to parse as XML
-                        ET.fromstring(response.text)
-                        print(f"✓ {name} - Valid XML response")
-                        self.working_apis[f'xml_{name.lower().replace(" ", "_")}'] = {
-                            'status': 'working',
-                            'type': 'xml_api',
-                            'url': url,
-                            'note': 'Returns valid XML data'
-                        }
-                    except ET.ParseError:
-                        if 'xml' in response.headers.get('content-type', '').lower():
-                            print(f"~ {name} - Claims to be XML but malformed")
+                return parsedate_to_datetime(expires).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return 0
+
+        return self.CACHE_TTL
+
+    async def _request(self, url, timeout, params, retries, method, max_bytes):
+        """Perform the actual network request for fetch()"""
+        async with self.semaphore:
+            for attempt in range(retries):
+                async with self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    retryable = response.status == 429 or response.status >= 500
+                    if not retryable or attempt == retries - 1:
+                        if method == 'HEAD':
+                            body = b''
+                        elif max_bytes is None:
+                            body = await response.read()
                         else:
-                            print(f"~ {name} - Not XML format")
-                
-            except Exception as e:
-                print(f"{name} error: {e}")
-
-    def test_patent_public_search_deep(self):
-        """Deep test of Patent Public Search for hidden APIs"""
-        print("\n=== Deep Testing Patent Public Search ===")
-        
+                            body = await self._read_prefix(response, max_bytes)
+                        return response.status, response.headers, body
+
+                await asyncio.sleep(2 ** attempt)
+
+    async def _read_prefix(self, response, max_bytes):
+        """Read at most max_bytes of a response body"""
+        chunks = []
+        remaining = max_bytes
+        while remaining > 0:
+            chunk = await response.content.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+
+    async def head(self, url, timeout=10):
+        """HEAD a URL and return (status, headers), falling back to GET if HEAD is rejected"""
         try:
-            # Get the main page first
-            main_url = "https://ppubs.uspto.gov/pubwebapp/"
-            response = self.session.get(main_url, timeout=15)
-            print(f"Patent Public Search main page: {response.status_code}")
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Look for API endpoints in JavaScript
-                scripts = soup.find_all('script')
-                api_clues = []
-                
-                for script in scripts:
-                    if script.string:
-                        text = script.string
-                        # Look for API-like URLs
-                        if '/api/' in text or 'search' in text or 'query' in text:
-                            lines = text.split('\n')
-                            for line in lines:
-                                if any(word in line.lower() for word in ['/api/', 'search', 'query', 'patent']):
-                                    if 'http' in line or '/' in line:
-                                        api_clues.append(line.strip())
-                
-                if api_clues:
-                    print("Found potential API endpoints:")
-                    for clue in api_clues[:10]:  # Show first 10
-                        print(f"  {clue}")
-                
-                # Try to find the actual search functionality
-                try:
-                    # Look for forms that might indicate search endpoints
-                    forms = soup.find_all('form')
-                    for form in forms:
-                        action = form.get('action', '')
-                        if action:
-                            print(f"Form action found: {action}")
-                            
-                            # Try to construct full URL
-                            if action.startswith('/'):
-                                full_url = f"https://ppubs.uspto.gov{action}"
-                                print(f"Testing form endpoint: {full_url}")
-                                
-                                # Try a simple GET to see if it responds
-                                try:
-                                    test_response = self.session.get(full_url, timeout=5)
-                                    if test_response.status_code in [200, 400, 405]:  # 400/405 might mean it expects POST
-                                        print(f"✓ Form endpoint responsive: {test_response.status_code}")
-                                        self.working_apis[f'search_form_{len(self.working_apis)}'] = {
-                                            'status': 'responsive',
-                                            'type': 'search_endpoint',
-                                            'url': full_url,
-                                            'note': f'Form endpoint, HTTP {test_response.status_code}'
-                                        }
-                                except:
-                                    pass
-                
-                except Exception as e:
-                    print(f"Error analyzing page: {e}")
-                    
+            status, headers, _ = await self.fetch(url, timeout=timeout, method='HEAD')
+            if status != 405:
+                return status, headers
+        except aiohttp.ClientError:
+            pass
+
+        status, headers, _ = await self.fetch(url, timeout=timeout, max_bytes=0)
+        return status, headers
+
+    async def run_one(self, probe):
+        """Fetch one probe and merge what its check finds
+
+        Returns the follow-up probes it expands to, for the caller to schedule.
+        """
+        try:
+            body = b''
+            if probe.method == 'HEAD':
+                status, headers = await self.head(probe.url, timeout=probe.timeout)
+            else:
+                status = 200
+                if probe.head_first:
+                    status, headers = await self.head(probe.url, timeout=probe.timeout)
+                if status == 200:
+                    status, headers, body = await self.fetch(
+                        probe.url,
+                        timeout=probe.timeout,
+                        params=probe.params,
+                        max_bytes=probe.max_bytes
+                    )
+            print(f"[{probe.category}] {probe.name}: {status}")
+
+            if probe.check:
+                self.working_apis.update(probe.check(probe, status, headers, body))
+            if probe.expand and status == 200:
+                return probe.expand(probe, headers, body)
+
         except Exception as e:
-            print(f"Patent Public Search deep test error: {e}")
-
-    def test_known_working_endpoints(self):
-        """Test endpoints that should theoretically work"""
-        print("\n=== Testing Known/Documented Endpoints ===")
-        
-        endpoints_to_test = [
-            # Current PatentsView
-            ("PatentsView Legacy", "https://api.patentsview.org/"),
-            ("PatentsView New", "https://search.patentsview.org/api/v1/"),
-            
-            # USPTO Official APIs
-            ("USPTO Developer Portal", "https://developer.uspto.gov/api-catalog"),
-            ("USPTO Open Data", "https://data.uspto.gov/api/"),
-            
-            # Assignment API
-            ("Patent Assignment Search", "https://assignment-api.uspto.gov/patent/search"),
-            
-            # TSDR API
-            ("TSDR Info", "https://tsdrapi.uspto.gov/ts/cd/casestatus/info"),
-            
-            # PAIR API (if exists)
-            ("PAIR", "https://portal.uspto.gov/pair/")
-        ]
-        
-        for name, url in endpoints_to_test:
-            try:
-                response = self.session.get(url, timeout=10)
-                print(f"{name}: {response.status_code}")
-                
-                if response.status_code == 200:
-                    content_type = response.headers.get('content-type', '')
-                    print(f"  Content-Type: {content_type}")
-                    
-                    # Check if it looks like an API
-                    if 'json' in content_type:
-                        try:
-                            data = response.json()
-                            print(f"✓ {name} - Valid JSON API")
-                            self.working_apis[f'api_{name.lower().replace(" ", "_")}'] = {
-                                'status': 'working',
-                                'type': 'json_api',
-                                'url': url,
-                                'note': 'Returns valid JSON'
-                            }
-                        except:
-                            print(f"~ {name} - Claims JSON but invalid")
-                    
-                    elif 'xml' in content_type:
-                        print(f"✓ {name} - XML API")
-                        self.working_apis[f'xml_api_{name.lower().replace(" ", "_")}'] = {
-                            'status': 'working',
-                            'type': 'xml_api',
-                            'url': url,
-                            'note': 'Returns XML data'
-                        }
-                    
-                    else:
-                        print(f"~ {name} - Web interface ({content_type})")
-                        self.working_apis[f'web_{name.lower().replace(" ", "_")}'] = {
-                            'status': 'web_interface',
-                            'type': 'html',
-                            'url': url,
-                            'note': 'Web interface, may be scrapable'
-                        }
-                        
-                elif response.status_code in [401, 403]:
-                    print(f"~ {name} - Requires authentication ({response.status_code})")
-                    self.working_apis[f'auth_{name.lower().replace(" ", "_")}'] = {
-                        'status': 'requires_auth',
-                        'type': 'api',
-                        'url': url,
-                        'note': f'Requires authentication (HTTP {response.status_code})'
-                    }
-                    
-            except Exception as e:
-                print(f"{name} error: {str(e)[:50]}...")
-
-    def run_comprehensive_test(self):
+            print(f"[{probe.category}] {probe.name} error: {str(e)[:50]}...")
+        return []
+
+    async def run_probes(self, probes):
+        """Run probes together, each under its own hard time limit
+
+        Follow-up probes are started as soon as their parent finishes and get
+        a full time limit of their own.
+        """
+        async with asyncio.TaskGroup() as tg:
+            async def bounded(probe):
+                try:
+                    follow_ups = await asyncio.wait_for(self.run_one(probe), self.PROBE_TIMEOUT)
+                except TimeoutError:
+                    print(f"[{probe.category}] {probe.name} timed out after {self.PROBE_TIMEOUT}s")
+                    return
+                for follow_up in follow_ups:
+                    tg.create_task(bounded(follow_up))
+
+            for probe in probes:
+                tg.create_task(bounded(probe))
+
+    async def run_comprehensive_test(self):
         """Run all tests"""
         print("=" * 80)
         print("COMPREHENSIVE USPTO API DISCOVERY - 2025")
         print("=" * 80)
-        
-        self.test_google_patents_scraping()
-        self.test_uspto_bulk_data()
-        self.test_alternative_patent_sources()
-        self.test_uspto_xml_feeds()
-        self.test_patent_public_search_deep()
-        self.test_known_working_endpoints()
-        
+
+        # One pooled session for every probe; checks only touch working_apis
+        # between awaits, so no extra locking is needed on the shared dict.
+        # Idle sockets are kept alive so repeat hits on uspto.gov reuse them, and
+        # lookups go through aiodns so the ~20 hosts resolve in parallel
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=8,
+            keepalive_timeout=30,
+            ssl=False,
+            resolver=aiohttp.AsyncResolver(),
+            use_dns_cache=True,
+            ttl_dns_cache=300
+        )
+        if self.use_cache:
+            self.cache = shelve.open(self.CACHE_FILE)
+        try:
+            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+                self.session = session
+                try:
+                    await asyncio.wait_for(self.run_probes(PROBES), self.RUN_TIMEOUT)
+                except TimeoutError:
+                    print(f"\n⚠ Discovery stopped after {self.RUN_TIMEOUT}s, reporting what was found so far")
+                finally:
+                    # Drop fetches abandoned by timed-out probes and let them
+                    # unwind before the session goes away
+                    for task in self._responses.values():
+                        task.cancel()
+                    await asyncio.gather(*self._responses.values(), return_exceptions=True)
+                    self._responses.clear()
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+                self.cache = None
+
         print("\n" + "=" * 80)
         print("SUMMARY OF DISCOVERIES")
         print("=" * 80)
-        
+
         if self.working_apis:
             # Group by type
-            by_type = {}
+            by_type = defaultdict(list)
             for name, info in self.working_apis.items():
-                api_type = info['type']
-                if api_type not in by_type:
-                    by_type[api_type] = []
-                by_type[api_type].append((name, info))
-            
+                by_type[info['type']].append((name, info))
+
             for api_type, apis in by_type.items():
                 print(f"\n{api_type.upper().replace('_', ' ')}:")
                 for name, info in apis:
@@ -342,49 +578,53 @@ class USPTOAPIFinder:
                     print(f"    Note: {info['note']}")
         else:
             print("❌ No working APIs discovered")
-        
+
         print(f"\nTotal discoveries: {len(self.working_apis)}")
-        
+
         # Save results
-        with open('working_apis_discovery.json', 'w') as f:
-            json.dump(self.working_apis, f, indent=2)
-        
+        with open('working_apis_discovery.json', 'wb') as f:
+            f.write(orjson.dumps(self.working_apis, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+
         print("Results saved to working_apis_discovery.json")
-        
+
         return self.working_apis
 
 def main():
-    finder = USPTOAPIFinder()
-    results = finder.run_comprehensive_test()
-    
+    parser = argparse.ArgumentParser(description="Find working USPTO data sources")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and don't update the on-disk probe cache")
+    args = parser.parse_args()
+
+    finder = USPTOAPIFinder(use_cache=not args.no_cache)
+    results = asyncio.run(finder.run_comprehensive_test())
+
     # Additional suggestions
     print("\n" + "=" * 80)
     print("RECOMMENDATIONS FOR WORKING DATA ACCESS")
     print("=" * 80)
-    
+
     recommendations = []
-    
+
     if 'google_patents_scraping' in results:
         recommendations.append("1. Google Patents Scraping - Most reliable for patent data")
-    
+
     bulk_apis = [k for k in results.keys() if 'bulk' in k]
     if bulk_apis:
         recommendations.append("2. USPTO Bulk Data Downloads - Good for large datasets")
-    
+
     working_apis = [k for k in results.keys() if results[k]['status'] == 'working']
     if working_apis:
         recommendations.append("3. Direct API Access - Some APIs are still functional")
-    
+
     auth_apis = [k for k in results.keys() if results[k]['status'] == 'requires_auth']
     if auth_apis:
         recommendations.append("4. Authenticated APIs - May work with proper credentials")
-    
+
     if recommendations:
         for rec in recommendations:
             print(rec)
     else:
         print("Consider using alternative patent databases or APIs")
-    
+
     print("=" * 80)
 
 if __name__ == "__main__":
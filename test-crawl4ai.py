@@ -10,49 +10,50 @@ import asyncio
 import json
 from crawl4ai import AsyncWebCrawler
 
-async def test_simple_crawl():
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+async def test_simple_crawl(crawler):
     """Test crawling a simple webpage"""
     print("Testing Crawl4AI with a simple webpage...")
     
-    async with AsyncWebCrawler(
-        headless=True,
-        verbose=True
-    ) as crawler:
-        # Test with a simple page first
-        result = await crawler.arun(url="https://www.example.com")
-        
-        print(f"Success: {result.success}")
-        print(f"Title: {result.title if hasattr(result, 'title') else 'N/A'}")
-        print(f"Content length: {len(result.text) if hasattr(result, 'text') else 0}")
-        
-        return result.success
+    # Test with a simple page first
+    result = await crawler.arun(url="https://www.example.com")
+    
+    print(f"Success: {result.success}")
+    print(f"Title: {result.title if hasattr(result, 'title') else 'N/A'}")
+    print(f"Content length: {len(result.text) if hasattr(result, 'text') else 0}")
+    
+    return result.success
 
-async def test_uspto_patent_search():
+async def test_uspto_patent_search(crawler):
     """Test crawling USPTO patent search"""
     print("\nTesting USPTO Patent Search...")
     
-    async with AsyncWebCrawler(
-        headless=True,
-        verbose=True,
-        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    ) as crawler:
-        # Try USPTO patent search
-        url = "https://patft.uspto.gov/netahtml/PTO/search-bool.html"
-        
-        result = await crawler.arun(
-            url=url,
-            wait_for_selector="form",
-            timeout=30
-        )
-        
-        print(f"Success: {result.success}")
-        if result.success:
-            print(f"Page title: {result.title if hasattr(result, 'title') else 'N/A'}")
-            print(f"Content preview: {result.text[:200] if hasattr(result, 'text') else 'N/A'}...")
-        else:
-            print(f"Error: {result.error if hasattr(result, 'error') else 'Unknown error'}")
-        
-        return result
+    # Try USPTO patent search
+    url = "https://patft.uspto.gov/netahtml/PTO/search-bool.html"
+    
+    result = await crawler.arun(
+        url=url,
+        wait_for_selector="form",
+        timeout=30
+    )
+    
+    print(f"Success: {result.success}")
+    if result.success:
+        print(f"Page title: {result.title if hasattr(result, 'title') else 'N/A'}")
+        print(f"Content preview: {result.text[:200] if hasattr(result, 'text') else 'N/A'}...")
+    else:
+        print(f"Error: {result.error if hasattr(result, 'error') else 'Unknown error'}")
+    
+    return result
+
+async def probe(session, url, headers):
+    """Fetch a URL and return (url, status, content length if 200 else 0)"""
+    async with session.get(url, headers=headers) as response:
+        if response.status == 200:
+            content = await response.text()
+            return url, response.status, len(content)
+        return url, response.status, 0
 
 async def test_uspto_direct():
     """Test direct USPTO access"""
@@ -61,40 +62,42 @@ async def test_uspto_direct():
     import aiohttp
     
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        'User-Agent': USER_AGENT
     }
     
     async with aiohttp.ClientSession() as session:
-        # Test PatFT search page
-        async with session.get(
-            "https://patft.uspto.gov/netahtml/PTO/search-bool.html",
-            headers=headers
-        ) as response:
-            print(f"PatFT Status: {response.status}")
-            if response.status == 200:
-                content = await response.text()
-                print(f"PatFT Content length: {len(content)}")
-                print("PatFT works with direct request!")
+        # PatFT search page and TESS trademark search are independent, fetch both at once
+        (_, patft_status, patft_length), (_, tess_status, _) = await asyncio.gather(
+            probe(session, "https://patft.uspto.gov/netahtml/PTO/search-bool.html", headers),
+            probe(session, "https://tmsearch.uspto.gov/search/search-information", headers)
+        )
+        
+        print(f"PatFT Status: {patft_status}")
+        if patft_status == 200:
+            print(f"PatFT Content length: {patft_length}")
+            print("PatFT works with direct request!")
         
-        # Test TESS trademark search
-        async with session.get(
-            "https://tmsearch.uspto.gov/search/search-information",
-            headers=headers
-        ) as response:
-            print(f"TESS Status: {response.status}")
-            if response.status == 200:
-                print("TESS works with direct request!")
+        print(f"TESS Status: {tess_status}")
+        if tess_status == 200:
+            print("TESS works with direct request!")
 
 async def main():
     """Run all tests"""
     try:
-        # Test basic functionality
-        success = await test_simple_crawl()
+        # One browser for both crawl tests instead of a Chromium startup each
+        async with AsyncWebCrawler(
+            headless=True,
+            verbose=True,
+            user_agent=USER_AGENT
+        ) as crawler:
+            # Test basic functionality
+            success = await test_simple_crawl(crawler)
+            
+            if success:
+                # Test USPTO
+                result = await test_uspto_patent_search(crawler)
         
         if success:
-            # Test USPTO
-            result = await test_uspto_patent_search()
-            
             # Test direct access as comparison
             await test_uspto_direct()
         else:
@@ -4,33 +4,158 @@ Final USPTO API Testing Script - 2025
 Tests the most promising USPTO data access methods based on research
 """
 
-import requests
-import json
-from urllib3.exceptions import InsecureRequestWarning
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
+import aiohttp
+import functools
+import logging
+import logging.handlers
+import orjson
+import os
+import queue
+import time
+from selectolax.lexbor import LexborHTMLParser
 import re
+import socket
+import sys
+from urllib.parse import urlsplit
 
-# Suppress SSL warnings
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+# Bulk download file types, each also counted when gzip/bzip2-compressed
+# (.xml.gz, .tar.bz2, ...)
+_EXT_TUPLE = tuple(
+    ext + compression
+    for ext in ('.xml', '.json', '.zip', '.tar')
+    for compression in ('', '.gz', '.bz2')
+)
 
-def test_google_patents_api():
-    """Test Google Patents as a working alternative"""
-    print("=" * 60)
-    print("TESTING GOOGLE PATENTS")
-    print("=" * 60)
+# --fast: pull download links straight out of the markup without parsing it.
+# Like the parsed path, only the path has to end in an extension; any query
+# string or fragment after it is allowed
+_HREF_RE = re.compile(
+    r'href=["\']([^"\'?#]+\.(?:xml|json|zip|tar)(?:\.(?:gz|bz2))?(?:[?#][^"\']*)?)["\']',
+    re.IGNORECASE
+)
+
+# Probes that passed within this many seconds are not re-run (USPTO_FORCE=1 re-runs all)
+RESULTS_FILE = 'final_api_test_results.json'
+RESULTS_TTL = 3600
+
+# Hint that a page references API endpoints; search() stops at the first hit
+_API_RE = re.compile(r'api', re.IGNORECASE)
+
+try:
+    # aiohttp can only decode brotli bodies when a brotli binding is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+COMMON_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING
+}
+
+logger = logging.getLogger('uspto_probe')
+
+def start_logging():
+    """Route probe output through a queue so concurrent probes never block on stdout
+
+    Only this script's logger is routed, so third-party INFO logging stays
+    out of the output. Returns the listener that writes the records; stop()
+    it to flush.
+    """
+    records = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(records, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+class _Section(logging.LoggerAdapter):
+    """Tag each line with the test it came from, since the tests run concurrently"""
     
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    def process(self, msg, kwargs):
+        return f"[{self.extra['section']}] {msg}", kwargs
+
+def load_fresh_results():
+    """Return {probe: checked_at} for previous passes recent enough to reuse"""
+    if os.environ.get('USPTO_FORCE') == '1':
+        return {}
     
     try:
-        # Test main page
-        response = session.get("https://patents.google.com/", timeout=10)
-        print(f"Google Patents homepage: {response.status_code}")
+        with open(RESULTS_FILE, 'rb') as f:
+            previous = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    
+    checked_at = previous.get('_checked_at', {})
+    now = time.time()
+    return {
+        key: checked_at[key] for key, passed in previous.items()
+        if passed is True and now - checked_at.get(key, 0) < RESULTS_TTL
+    }
+
+def _make_session():
+    """Build the pooled session every probe shares"""
+    # Hosts hit by several probes (uspto.gov, patents.google.com) reuse
+    # connections, and aiodns resolves each host once per run; when a host
+    # has several A records the first to accept the connection wins
+    connector = aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=8,
+        ssl=False,
+        resolver=aiohttp.AsyncResolver(),
+        use_dns_cache=True,
+        ttl_dns_cache=600,
+        family=socket.AF_INET,
+        happy_eyeballs_delay=0.25
+    )
+    timeout = aiohttp.ClientTimeout(total=15)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=COMMON_HEADERS)
+
+async def fetch(session, url, timeout=10, max_bytes=None, **kwargs):
+    """GET a URL on the shared session and return (status, body text)
+
+    With max_bytes, only that much of the body is read off the wire.
+    """
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs) as response:
+        if max_bytes is None:
+            return response.status, await response.text(errors='replace')
         
-        if response.status_code == 200:
+        chunks = []
+        remaining = max_bytes
+        while remaining > 0:
+            chunk = await response.content.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return response.status, b''.join(chunks).decode(errors='replace')
+
+async def head(session, url, timeout=10):
+    """HEAD a URL (following redirects) and return its status, no body is transferred
+
+    Servers that reject HEAD with 405 get a GET whose body is never read.
+    """
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with session.head(url, allow_redirects=True, timeout=client_timeout) as response:
+        if response.status != 405:
+            return response.status
+    
+    async with session.get(url, timeout=client_timeout) as response:
+        return response.status
+
+async def test_google_patents_api(session):
+    """Test Google Patents as a working alternative"""
+    log = _Section(logger, {'section': 'Google Patents'})
+    
+    try:
+        # Test main page
+        status, _ = await fetch(session, "https://patents.google.com/")
+        log.info("Google Patents homepage: %s", status)
+            
+        if status == 200:
             # Test search functionality
             search_url = "https://patents.google.com/xhr/query"
             params = {
@@ -39,32 +164,53 @@ def test_google_patents_api():
                 'content': '1'
             }
             
-            search_response = session.get(search_url, params=params, timeout=10)
-            print(f"Search API: {search_response.status_code}")
+            search_status, _ = await fetch(session, search_url, params=params)
+            log.info("Search API: %s", search_status)
             
-            if search_response.status_code == 200:
-                print("✅ WORKING: Google Patents search API")
-                print("   URL:", search_url)
-                print("   Method: GET with URL params")
-                print("   Sample data available: Yes")
+            if search_status == 200:
+                log.info("✅ WORKING: Google Patents search API")
+                log.info("   URL: %s", search_url)
+                log.info("   Method: GET with URL params")
+                log.info("   Sample data available: Yes")
                 return True
                 
     except Exception as e:
-        print(f"❌ Google Patents error: {e}")
+        log.error("❌ Google Patents error: %s", e)
     
     return False
 
-def test_uspto_bulk_data():
-    """Test USPTO bulk data access"""
-    print("\n" + "=" * 60)
-    print("TESTING USPTO BULK DATA ACCESS")
-    print("=" * 60)
+def _is_download_link(href):
+    """Whether an href's path ends in a bulk download extension; malformed hrefs never do"""
+    try:
+        return urlsplit(href).path.lower().endswith(_EXT_TUPLE)
+    except ValueError:
+        return False
+
+async def _probe_bulk_url(session, url, log, fast=False):
+    """Fetch one bulk data page and return the download links it offers"""
+    try:
+        status, text = await fetch(session, url)
+        log.info("%s: %s", url, status)
+            
+        if status == 200:
+            # Look for download links
+            if fast:
+                return _HREF_RE.findall(text)
+            
+            tree = LexborHTMLParser(text)
+            return [
+                href for href in (node.attributes.get('href') for node in tree.css('a[href]'))
+                if href and _is_download_link(href)
+            ]
+                
+    except Exception as e:
+        log.error("Error with %s: %s", url, e)
     
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    return []
+
+async def test_uspto_bulk_data(session, fast=False):
+    """Test USPTO bulk data access"""
+    log = _Section(logger, {'section': 'Bulk Data'})
     
     bulk_urls = [
         "https://data.uspto.gov/bulkdata",
@@ -72,80 +218,59 @@ def test_uspto_bulk_data():
         "https://bulkdata.uspto.gov/"
     ]
     
-    for url in bulk_urls:
-        try:
-            response = session.get(url, timeout=10)
-            print(f"{url}: {response.status_code}")
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Look for download links
-                links = soup.find_all('a', href=True)
-                download_links = []
-                
-                for link in links:
-                    href = link['href']
-                    if any(ext in href.lower() for ext in ['.xml', '.json', '.zip', '.tar']):
-                        download_links.append(href)
-                
+    # Race every candidate; the first one with download links wins and the rest are cancelled
+    tasks = {asyncio.create_task(_probe_bulk_url(session, url, log, fast)): url for url in bulk_urls}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                download_links = task.result()
                 if download_links:
-                    print(f"✅ WORKING: USPTO Bulk Data at {url}")
-                    print(f"   Found {len(download_links)} potential download links")
-                    print("   Sample links:")
+                    url = tasks[task]
+                    log.info("✅ WORKING: USPTO Bulk Data at %s", url)
+                    log.info("   Found %s potential download links", len(download_links))
+                    log.info("   Sample links:")
                     for link in download_links[:3]:
-                        print(f"     {link}")
+                        log.info("     %s", link)
                     return True
-                        
-        except Exception as e:
-            print(f"Error with {url}: {e}")
+    finally:
+        # Let the losing pages unwind before the session can be closed
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
     
     return False
 
-def test_patent_public_search():
+async def test_patent_public_search(session):
     """Test Patent Public Search for hidden APIs"""
-    print("\n" + "=" * 60)
-    print("TESTING PATENT PUBLIC SEARCH")
-    print("=" * 60)
-    
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    log = _Section(logger, {'section': 'Patent Public Search'})
     
     try:
-        response = session.get("https://ppubs.uspto.gov/pubwebapp/", timeout=15)
-        print(f"Patent Public Search: {response.status_code}")
-        
-        if response.status_code == 200:
-            print("✅ WORKING: Patent Public Search (Web Interface)")
-            print("   URL: https://ppubs.uspto.gov/pubwebapp/")
-            print("   Method: Web scraping possible")
-            print("   Contains: Full patent database access")
+        # The API hint only needs the start of the page, not the whole app shell
+        status, text = await fetch(session, "https://ppubs.uspto.gov/pubwebapp/", timeout=15, max_bytes=65536)
+        log.info("Patent Public Search: %s", status)
+            
+        if status == 200:
+            log.info("✅ WORKING: Patent Public Search (Web Interface)")
+            log.info("   URL: https://ppubs.uspto.gov/pubwebapp/")
+            log.info("   Method: Web scraping possible")
+            log.info("   Contains: Full patent database access")
             
             # Look for API endpoints in the page
-            if 'api' in response.text.lower():
-                print("   Note: May contain hidden API endpoints")
+            if _API_RE.search(text):
+                log.info("   Note: May contain hidden API endpoints")
             
             return True
             
     except Exception as e:
-        print(f"❌ Patent Public Search error: {e}")
+        log.error("❌ Patent Public Search error: %s", e)
     
     return False
 
-def test_alternative_sources():
+async def test_alternative_sources(session):
     """Test alternative patent data sources"""
-    print("\n" + "=" * 60)
-    print("TESTING ALTERNATIVE SOURCES")
-    print("=" * 60)
-    
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    log = _Section(logger, {'section': 'Alternative Sources'})
     
     sources = [
         ("The Lens", "https://www.lens.org/lens/"),
@@ -156,33 +281,27 @@ def test_alternative_sources():
     
     working_count = 0
     
-    for name, url in sources:
-        try:
-            response = session.get(url, timeout=10)
-            print(f"{name}: {response.status_code}")
-            
-            if response.status_code == 200:
-                print(f"✅ WORKING: {name}")
-                print(f"   URL: {url}")
-                print("   Method: Web scraping")
-                working_count += 1
-                
-        except Exception as e:
-            print(f"❌ {name} error: {str(e)[:50]}")
+    responses = await asyncio.gather(*(head(session, url) for _, url in sources), return_exceptions=True)
+    
+    for (name, url), response in zip(sources, responses):
+        if isinstance(response, Exception):
+            log.error("❌ %s error: %s", name, str(response)[:50])
+            continue
+        
+        status = response
+        log.info("%s: %s", name, status)
+        
+        if status == 200:
+            log.info("✅ WORKING: %s", name)
+            log.info("   URL: %s", url)
+            log.info("   Method: Web scraping")
+            working_count += 1
     
     return working_count > 0
 
-def test_direct_patent_access():
+async def test_direct_patent_access(session):
     """Test direct patent document access"""
-    print("\n" + "=" * 60)
-    print("TESTING DIRECT PATENT ACCESS")
-    print("=" * 60)
-    
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
+    log = _Section(logger, {'section': 'Direct Access'})
     
     # Test direct access to patent documents
     test_patents = [
@@ -191,27 +310,27 @@ def test_direct_patent_access():
         "https://patft.uspto.gov/netacgi/nph-Parser?patentnumber=10000000"
     ]
     
-    for url in test_patents:
-        try:
-            response = session.get(url, timeout=10)
-            print(f"Direct access test: {response.status_code}")
-            
-            if response.status_code == 200:
-                print(f"✅ WORKING: Direct patent access")
-                print(f"   URL: {url}")
-                print("   Method: Direct document access")
-                return True
-                
-        except Exception as e:
-            print(f"Error: {str(e)[:30]}")
+    responses = await asyncio.gather(*(head(session, url) for url in test_patents), return_exceptions=True)
+    
+    for url, response in zip(test_patents, responses):
+        if isinstance(response, Exception):
+            log.error("%s error: %s", url, str(response)[:30])
+            continue
+        
+        status = response
+        log.info("%s: %s", url, status)
+        
+        if status == 200:
+            log.info("✅ WORKING: Direct patent access")
+            log.info("   URL: %s", url)
+            log.info("   Method: Direct document access")
+            return True
     
     return False
 
-def test_commercial_apis():
+async def test_commercial_apis(session):
     """Test commercial/third-party patent APIs"""
-    print("\n" + "=" * 60)
-    print("TESTING COMMERCIAL APIs")
-    print("=" * 60)
+    log = _Section(logger, {'section': 'Commercial APIs'})
     
     # Note: These would require API keys, but we can test if they're responsive
     commercial_apis = [
@@ -220,98 +339,115 @@ def test_commercial_apis():
         ("Derwent Innovation", "https://clarivate.com/derwent/")
     ]
     
-    session = requests.Session()
-    session.verify = False
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    })
-    
     available_count = 0
     
-    for name, url in commercial_apis:
-        try:
-            response = session.get(url, timeout=10)
-            print(f"{name}: {response.status_code}")
-            
-            if response.status_code == 200:
-                print(f"✅ AVAILABLE: {name}")
-                print(f"   URL: {url}")
-                print("   Note: May require subscription/API key")
-                available_count += 1
-                
-        except Exception as e:
-            print(f"❌ {name} error: {str(e)[:30]}")
+    responses = await asyncio.gather(*(head(session, url) for _, url in commercial_apis), return_exceptions=True)
+    
+    for (name, url), response in zip(commercial_apis, responses):
+        if isinstance(response, Exception):
+            log.error("❌ %s error: %s", name, str(response)[:30])
+            continue
+        
+        status = response
+        log.info("%s: %s", name, status)
+        
+        if status == 200:
+            log.info("✅ AVAILABLE: %s", name)
+            log.info("   URL: %s", url)
+            log.info("   Note: May require subscription/API key")
+            available_count += 1
     
     return available_count > 0
 
-def main():
+async def main():
     """Run all tests and provide recommendations"""
-    print("USPTO API TESTING - FINAL COMPREHENSIVE ANALYSIS")
-    print("=" * 80)
-    
-    results = {}
-    
-    # Run all tests
-    results['google_patents'] = test_google_patents_api()
-    results['bulk_data'] = test_uspto_bulk_data()
-    results['patent_search'] = test_patent_public_search()
-    results['alternatives'] = test_alternative_sources()
-    results['direct_access'] = test_direct_patent_access()
-    results['commercial'] = test_commercial_apis()
+    parser = argparse.ArgumentParser(description="Test the most promising USPTO data access methods")
+    parser.add_argument('--fast', action='store_true', help="find bulk download links with a regex instead of parsing HTML")
+    args = parser.parse_args()
+    
+    logger.info("USPTO API TESTING - FINAL COMPREHENSIVE ANALYSIS")
+    logger.info("=" * 80)
+    
+    tests = {
+        'google_patents': test_google_patents_api,
+        'bulk_data': functools.partial(test_uspto_bulk_data, fast=args.fast),
+        'patent_search': test_patent_public_search,
+        'alternatives': test_alternative_sources,
+        'direct_access': test_direct_patent_access,
+        'commercial': test_commercial_apis
+    }
+    
+    # Skip probes that already passed within the last hour
+    cached = load_fresh_results()
+    for key in cached:
+        logger.info("%s: cached ✅ (set USPTO_FORCE=1 to re-run)", key)
+    pending = [key for key in tests if key not in cached]
+    
+    # Run the rest concurrently on one pooled session
+    async with _make_session() as session:
+        outcomes = await asyncio.gather(*(tests[key](session) for key in pending), return_exceptions=True)
+    
+    outcomes = dict(zip(pending, outcomes))
+    results = {key: key in cached or outcomes[key] is True for key in tests}
     
     # Summary
-    print("\n" + "=" * 80)
-    print("FINAL RECOMMENDATIONS")
-    print("=" * 80)
+    logger.info("\n" + "=" * 80)
+    logger.info("FINAL RECOMMENDATIONS")
+    logger.info("=" * 80)
     
     working_methods = []
     
     if results['google_patents']:
         working_methods.append("1. Google Patents API - BEST OPTION")
-        print("✅ Google Patents API")
-        print("   - Reliable and fast")
-        print("   - No API key required")
-        print("   - Full patent data access")
-        print("   - Easy to implement")
+        logger.info("✅ Google Patents API")
+        logger.info("   - Reliable and fast")
+        logger.info("   - No API key required")
+        logger.info("   - Full patent data access")
+        logger.info("   - Easy to implement")
     
     if results['patent_search']:
         working_methods.append("2. Patent Public Search - Web Scraping")
-        print("✅ USPTO Patent Public Search")
-        print("   - Official USPTO data")
-        print("   - Requires web scraping")
-        print("   - Most comprehensive data")
-        print("   - May be slower than API")
+        logger.info("✅ USPTO Patent Public Search")
+        logger.info("   - Official USPTO data")
+        logger.info("   - Requires web scraping")
+        logger.info("   - Most comprehensive data")
+        logger.info("   - May be slower than API")
     
     if results['bulk_data']:
         working_methods.append("3. USPTO Bulk Data Downloads")
-        print("✅ USPTO Bulk Data")
-        print("   - Official bulk datasets")
-        print("   - Good for large-scale analysis")
-        print("   - XML/JSON formats available")
-        print("   - Periodic updates")
+        logger.info("✅ USPTO Bulk Data")
+        logger.info("   - Official bulk datasets")
+        logger.info("   - Good for large-scale analysis")
+        logger.info("   - XML/JSON formats available")
+        logger.info("   - Periodic updates")
     
     if results['alternatives']:
         working_methods.append("4. Alternative Patent Databases")
-        print("✅ Alternative Sources")
-        print("   - The Lens, WIPO, EPO")
-        print("   - Different data coverage")
-        print("   - May complement USPTO data")
-        print("   - Various access methods")
+        logger.info("✅ Alternative Sources")
+        logger.info("   - The Lens, WIPO, EPO")
+        logger.info("   - Different data coverage")
+        logger.info("   - May complement USPTO data")
+        logger.info("   - Various access methods")
     
-    print(f"\nTotal working methods found: {len(working_methods)}")
+    logger.info("\nTotal working methods found: %s", len(working_methods))
     
     if working_methods:
-        print("\n🎯 RECOMMENDED IMPLEMENTATION ORDER:")
+        logger.info("\n🎯 RECOMMENDED IMPLEMENTATION ORDER:")
         for method in working_methods:
-            print(f"   {method}")
+            logger.info("   %s", method)
     else:
-        print("\n❌ No working methods found - consider commercial APIs")
+        logger.info("\n❌ No working methods found - consider commercial APIs")
     
-    # Save results
-    with open('final_api_test_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Save results, stamping the probes that actually ran so the next run can reuse them
+    checked_at = {**cached, **{key: time.time() for key in pending}}
+    with open(RESULTS_FILE, 'wb') as f:
+        f.write(orjson.dumps({**results, '_checked_at': checked_at}, option=orjson.OPT_INDENT_2))
     
-    print("\nResults saved to final_api_test_results.json")
+    logger.info("\nResults saved to %s", RESULTS_FILE)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    listener = start_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()
\ No newline at end of file
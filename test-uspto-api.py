@@ -8,157 +8,160 @@ Date: July 28, 2025
 
 import asyncio
 import aiohttp
-import json
+import orjson
 
-async def test_uspto_apis():
+# PatentsView query parameters, already JSON-encoded
+_PV_Q = '{"_text_any":{"patent_title":"artificial intelligence"}}'
+_PV_F = '["patent_number","patent_title","patent_date"]'
+_PV_O = '{"per_page":5}'
+
+# Browser-like headers for the API checks
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/html, */*'
+}
+
+async def _check_patentsview(session):
+    """USPTO Developer API (PatentsView)"""
+    try:
+        async with session.get(
+            "https://api.patentsview.org/patents/query",
+            params={"q": _PV_Q, "f": _PV_F, "o": _PV_O},
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[PatentsView] Status: {response.status}")
+            if response.status == 200:
+                data = orjson.loads(await response.read())
+                print(f"[PatentsView] Found {data.get('total_patent_count', 0)} patents")
+                if data.get('patents'):
+                    for patent in data['patents'][:2]:
+                        print(f"[PatentsView] - {patent.get('patent_number')}: {patent.get('patent_title')}")
+    except Exception as e:
+        print(f"[PatentsView] Error: {e}")
+
+async def _check_assignment_api(session):
+    """USPTO Assignment API"""
+    try:
+        async with session.get(
+            "https://assignment-api.uspto.gov/patent/search",
+            params={
+                "query": "artificial intelligence",
+                "rows": 5
+            },
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[Assignment API] Status: {response.status}")
+            if response.status == 200:
+                text = await response.text()
+                print(f"[Assignment API] Response length: {len(text)}")
+    except Exception as e:
+        print(f"[Assignment API] Error: {e}")
+
+async def _check_peds(session):
+    """USPTO PEDS (Patent Examination Data System)"""
+    try:
+        async with session.get(
+            "https://ped.uspto.gov/api/queries",
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[PEDS] Status: {response.status}")
+    except Exception as e:
+        print(f"[PEDS] Error: {e}")
+
+async def _check_open_data_portal(session):
+    """USPTO Open Data Portal"""
+    try:
+        async with session.get(
+            "https://developer.uspto.gov/api-catalog",
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[Open Data Portal] Status: {response.status}")
+    except Exception as e:
+        print(f"[Open Data Portal] Error: {e}")
+
+async def _check_google_patents(session):
+    """Google Patents (alternative source)"""
+    try:
+        async with session.get(
+            "https://patents.google.com/xhr/query",
+            params={
+                "url": "q=artificial+intelligence&oq=artificial+intelligence",
+                "exp": "",
+                "content": "1"
+            },
+            headers=_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[Google Patents] Status: {response.status}")
+            if response.status == 200:
+                text = await response.text()
+                print(f"[Google Patents] Response length: {len(text)}")
+    except Exception as e:
+        print(f"[Google Patents] Error: {e}")
+
+async def test_uspto_apis(session):
     """Test various USPTO APIs and endpoints"""
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        'Accept': 'application/json, text/html, */*'
-    }
-    
-    async with aiohttp.ClientSession() as session:
-        # Test 1: USPTO Developer API (PatentsView)
-        print("1. Testing PatentsView API...")
-        try:
-            async with session.get(
-                "https://api.patentsview.org/patents/query",
-                params={
-                    "q": json.dumps({"_text_any": {"patent_title": "artificial intelligence"}}),
-                    "f": json.dumps(["patent_number", "patent_title", "patent_date"]),
-                    "o": json.dumps({"per_page": 5})
-                },
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                print(f"   Status: {response.status}")
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"   Found {data.get('total_patent_count', 0)} patents")
-                    if data.get('patents'):
-                        for patent in data['patents'][:2]:
-                            print(f"   - {patent.get('patent_number')}: {patent.get('patent_title')}")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        # Test 2: USPTO Assignment API
-        print("\n2. Testing USPTO Assignment API...")
-        try:
-            async with session.get(
-                "https://assignment-api.uspto.gov/patent/search",
-                params={
-                    "query": "artificial intelligence",
-                    "rows": 5
-                },
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                print(f"   Status: {response.status}")
-                if response.status == 200:
-                    text = await response.text()
-                    print(f"   Response length: {len(text)}")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        # Test 3: USPTO PEDS (Patent Examination Data System)
-        print("\n3. Testing USPTO PEDS API...")
-        try:
-            async with session.get(
-                "https://ped.uspto.gov/api/queries",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                print(f"   Status: {response.status}")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        # Test 4: USPTO Open Data Portal
-        print("\n4. Testing USPTO Open Data Portal...")
-        try:
-            async with session.get(
-                "https://developer.uspto.gov/api-catalog",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                print(f"   Status: {response.status}")
-        except Exception as e:
-            print(f"   Error: {e}")
-        
-        # Test 5: Google Patents (alternative source)
-        print("\n5. Testing Google Patents as alternative...")
-        try:
-            async with session.get(
-                "https://patents.google.com/xhr/query",
-                params={
-                    "url": "q=artificial+intelligence&oq=artificial+intelligence",
-                    "exp": "",
-                    "content": "1"
-                },
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                print(f"   Status: {response.status}")
-                if response.status == 200:
-                    text = await response.text()
-                    print(f"   Response length: {len(text)}")
-        except Exception as e:
-            print(f"   Error: {e}")
+    # The checks are independent, so they all run at once; every line they
+    # print is tagged with the check it belongs to
+    await asyncio.gather(
+        _check_patentsview(session),
+        _check_assignment_api(session),
+        _check_peds(session),
+        _check_open_data_portal(session),
+        _check_google_patents(session)
+    )
 
-async def test_simple_scraping():
-    """Test simple web scraping with requests"""
-    print("\n6. Testing simple scraping approach...")
-    
-    import requests
+async def test_simple_scraping(session):
+    """Test simple web scraping of the search page"""
     from bs4 import BeautifulSoup
     
     # Test USPTO search page availability
     try:
-        response = requests.get(
+        async with session.get(
             "https://ppubs.uspto.gov/pubwebapp/",
             headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             },
-            timeout=10
-        )
-        print(f"   Patent Public Search status: {response.status_code}")
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            title = soup.find('title')
-            print(f"   Page title: {title.text if title else 'N/A'}")
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[Scraping] Patent Public Search status: {response.status}")
+            
+            if response.status == 200:
+                soup = BeautifulSoup(await response.text(), 'lxml')
+                title = soup.find('title')
+                print(f"[Scraping] Page title: {title.text if title else 'N/A'}")
     except Exception as e:
-        print(f"   Error: {e}")
+        print(f"[Scraping] Error: {e}")
 
-def test_sync_approach():
-    """Test synchronous approach with requests"""
-    print("\n7. Testing synchronous requests...")
-    
-    import requests
-    
-    # PatentsView API - synchronous
+async def test_sync_approach(session):
+    """Test the minimal single-request approach"""
+    # PatentsView API - one plain request, no browser headers
     try:
-        response = requests.get(
+        async with session.get(
             "https://api.patentsview.org/patents/query",
             params={
                 "q": '{"_text_any":{"patent_title":"machine learning"}}',
-                "f": '["patent_number","patent_title","patent_date"]',
+                "f": _PV_F,
                 "o": '{"per_page":3}'
             },
             headers={
                 'User-Agent': 'USPTO-Crawler/0.2'
             },
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   SUCCESS! Found {data.get('total_patent_count', 0)} patents")
-            for patent in data.get('patents', [])[:3]:
-                print(f"   - {patent['patent_number']}: {patent['patent_title'][:50]}...")
-            return True
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            print(f"[Single Request] Status: {response.status}")
+            if response.status == 200:
+                data = orjson.loads(await response.read())
+                print(f"[Single Request] SUCCESS! Found {data.get('total_patent_count', 0)} patents")
+                for patent in data.get('patents', [])[:3]:
+                    print(f"[Single Request] - {patent['patent_number']}: {patent['patent_title'][:50]}...")
+                return True
     except Exception as e:
-        print(f"   Error: {e}")
+        print(f"[Single Request] Error: {e}")
     
     return False
 
@@ -168,14 +171,13 @@ async def main():
     print("USPTO API and Access Testing")
     print("=" * 60)
     
-    # Test APIs
-    await test_uspto_apis()
-    
-    # Test simple scraping
-    await test_simple_scraping()
-    
-    # Test synchronous approach
-    test_sync_approach()
+    # APIs, simple scraping and the single-request check share one session and run together
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(
+            test_uspto_apis(session),
+            test_simple_scraping(session),
+            test_sync_approach(session)
+        )
     
     print("\n" + "=" * 60)
     print("Testing complete!")
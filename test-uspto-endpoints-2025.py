@@ -6,391 +6,554 @@ Author: Yobie Benjamin
 Date: August 23, 2025
 """
 
+import argparse
 import asyncio
-import aiohttp
+import certifi
+import hashlib
+import httpx
 import json
+import logging
+import logging.handlers
+import orjson
+import queue
+import re
+import shelve
 import ssl
+import sys
 import requests
-from urllib3.exceptions import InsecureRequestWarning
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlencode
 import time
 from typing import Dict, List, Any
 
-# Suppress SSL warnings for testing
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+logger = logging.getLogger('uspto')
+
+def start_logging():
+    """Route test output through a queue so concurrent probes never block on stdout
+
+    Only this script's logger is routed, so httpx's per-request INFO lines
+    stay out of the output. Returns the listener that writes the records;
+    stop() it to flush.
+    """
+    records = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = logging.handlers.QueueListener(records, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+class _Section(logging.LoggerAdapter):
+    """Tag each line with the test it came from, since the tests run concurrently"""
+    
+    def process(self, msg, kwargs):
+        return f"[{self.extra['section']}] {msg}", kwargs
+
+# PatentsView liveness queries: a single known patent, id field only, so
+# each API answers with a few hundred bytes. Serialized and URL-encoded once
+# at import
+_PV_V2_URL = "https://search.patentsview.org/api/v1/patent/"
+_PV_LEGACY_URL = "https://api.patentsview.org/patents/query"
+_PV_MINIMAL_PARAMS = {
+    "q": json.dumps({"patent_id": "10000000"}),
+    "f": json.dumps(["patent_id"]),
+    "o": json.dumps({"per_page": 1})
+}
+_PV_LEGACY_MINIMAL_PARAMS = {
+    "q": json.dumps({"patent_number": "10000000"}),
+    "f": json.dumps(["patent_number"]),
+    "o": json.dumps({"per_page": 1})
+}
+_PV_V2_QUERY = f"{_PV_V2_URL}?{urlencode(_PV_MINIMAL_PARAMS)}"
+_PV_LEGACY_QUERY = f"{_PV_LEGACY_URL}?{urlencode(_PV_LEGACY_MINIMAL_PARAMS)}"
+
+def _verified_ssl_context():
+    """Build a certificate-verifying SSL context
+
+    Uses the operating system trust store when truststore is installed and
+    certifi's CA bundle otherwise.
+    """
+    try:
+        import truststore
+        return truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    except ImportError:
+        return ssl.create_default_context(cafile=certifi.where())
+
+# One context for the whole run, so repeat handshakes with a host can resume
+# its TLS session instead of starting over
+_SSL_CONTEXT = _verified_ssl_context()
+
+# European Patent Office OPS search, with its query baked in
+_EPO_OPS_URL = "https://ops.epo.org/3.2/rest-services/published-data/search/biblio"
+_EPO_OPS_QUERY = f"{_EPO_OPS_URL}?{urlencode({'q': 'artificial intelligence'})}"
+
+# Keywords that mark a bulk data portal, matched against the raw page bytes
+_BULK_RE = re.compile(rb'bulk|xml|json|download', re.IGNORECASE)
+
+# Failures a probe records as its result; anything else is a bug and propagates
+_PROBE_ERRORS = (
+    httpx.HTTPError,
+    requests.RequestException,
+    ssl.SSLError,
+    asyncio.TimeoutError,
+    orjson.JSONDecodeError
+)
 
 class USPTOAPITester:
-    def __init__(self):
-        # Create SSL context that bypasses verification
-        self.ssl_context = ssl.create_default_context()
-        self.ssl_context.check_hostname = False
-        self.ssl_context.verify_mode = ssl.CERT_NONE
+    # On-disk probe cache, reused across runs for an hour and revalidated after
+    CACHE_FILE = 'uspto_endpoint_probes'
+    CACHE_TTL = 3600
+    CACHEABLE_STATUSES = (200, 206, 400, 401, 403, 404, 405)
+    
+    # Fail fast: a probe gets 2s to connect, 3s between reads and 6s overall,
+    # and the whole run is cut off after 20s
+    FAST_TIMEOUT = httpx.Timeout(6.0, connect=2.0, read=3.0)
+    PROBE_TIMEOUT = 6
+    SYNC_TIMEOUT = (2, 3)
+    RUN_TIMEOUT = 20
+    
+    # USPTO Open Data Portal APIs as (name, API URL)
+    _ENDPOINTS_ODP = (
+        ('PTAB API v2', 'https://api.uspto.gov/ptab/v2/search'),
+        ('Patent Assignment API', 'https://assignment-api.uspto.gov/patent/search'),
+        ('TSDR Data API', 'https://tsdrapi.uspto.gov/ts/cd/casestatus/sn79218695/info.json')
+    )
+    
+    # Endpoints checked with the blocking requests client as (name, URL).
+    # PatentsView is already covered by the async test
+    _ENDPOINTS_SYNC = (
+        ('USPTO Developer Portal', 'https://developer.uspto.gov/'),
+        ('TSDR API', 'https://tsdrapi.uspto.gov/ts/cd/casestatus/sn88123456/info.xml'),
+        ('Patent Assignment', 'https://assignment-api.uspto.gov/patent/search?query=artificial')
+    )
+
+    def __init__(self, use_cache=True):
+        # Verified SSL context shared with every client
+        self.ssl_context = _SSL_CONTEXT
         
         # Standard headers
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/json, text/html, application/xml, */*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive'
+            'Accept-Encoding': 'gzip, deflate'
         }
         
+        # Blocking client for the synchronous test; one pooled session with
+        # urllib3 keep-alive, verifying against certifi's CA bundle
+        self._sync_session = requests.Session()
+        self._sync_session.verify = certifi.where()
+        self._sync_session.headers.update(self.headers)
+        self._sync_session.mount('https://', HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        
         # Results storage
         self.results = {}
+        
+        self.use_cache = use_cache
+        self.cache = None
+
+    async def __aenter__(self):
+        # One pooled HTTP/2 client for every test, so hosts probed more than
+        # once (uspto.gov, ppubs) multiplex requests over a single TLS connection
+        self._client = httpx.AsyncClient(
+            http2=True,
+            verify=self.ssl_context,
+            headers=self.headers,
+            timeout=self.FAST_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+        self._sem = asyncio.Semaphore(16)
+        if self.use_cache:
+            self.cache = shelve.open(self.CACHE_FILE)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._sync_session.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    async def _fetch(self, url, method='GET', max_bytes=None, params=None, headers=None):
+        """Request a URL and return (status, content type, raw body)
+
+        Fresh responses from earlier runs are served from the on-disk cache;
+        stale ones are revalidated with their ETag/Last-Modified.
+        """
+        if self.cache is None:
+            status, response_headers, body = await self._send(url, method, max_bytes, params, headers)
+            return status, response_headers.get('content-type', ''), body
+        
+        query = urlencode(sorted(params.items())) if params else ''
+        key = hashlib.blake2b(f"{method} {url}?{query} {max_bytes}".encode()).hexdigest()
+        entry = self.cache.get(key)
+        if entry and entry['expires_at'] > time.time():
+            return entry['status'], entry['content_type'], entry['body']
+        
+        if entry:
+            headers = dict(headers or {})
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        
+        status, response_headers, body = await self._send(url, method, max_bytes, params, headers)
+        
+        if status == 304 and entry:
+            entry['expires_at'] = time.time() + self.CACHE_TTL
+            self.cache[key] = entry
+            return entry['status'], entry['content_type'], entry['body']
+        
+        content_type = response_headers.get('content-type', '')
+        if status in self.CACHEABLE_STATUSES:
+            self.cache[key] = {
+                'status': status,
+                'content_type': content_type,
+                'body': body,
+                'etag': response_headers.get('etag'),
+                'last_modified': response_headers.get('last-modified'),
+                'expires_at': time.time() + self.CACHE_TTL
+            }
+        return status, content_type, body
+
+    async def _send(self, url, method, max_bytes, params, headers):
+        """Request a URL on the shared client and return (status, headers, raw body)
+
+        HEAD probes return an empty body. With max_bytes, only that much of a
+        GET body is read off the wire; max_bytes=0 releases the response as
+        soon as the status is in. At most 16 probes are in flight at once so
+        no single host gets hammered, and each one gets PROBE_TIMEOUT seconds
+        once it starts.
+        """
+        async with self._sem, asyncio.timeout(self.PROBE_TIMEOUT):
+            async with self._client.stream(method, url, params=params, headers=headers) as response:
+                if method == 'HEAD' or max_bytes == 0:
+                    return response.status_code, response.headers, b''
+                if max_bytes is None:
+                    return response.status_code, response.headers, await response.aread()
+                
+                body = b''
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= max_bytes:
+                        break
+                return response.status_code, response.headers, body[:max_bytes]
+
+    def _record_error(self, name, url, error):
+        """Store a failed probe in the results"""
+        self.results[name] = {
+            'status': 'error',
+            'error': type(error).__name__,
+            'endpoint': url
+        }
+
+    async def _probe(self, log, name, url, *, params=None, expect_markers=(), method='GET',
+                     ok_statuses=(200,), max_bytes=None, headers=None, label=None, record=None,
+                     endpoint=None):
+        """Probe one endpoint, log its outcome and return (status, content type, raw body)
+
+        The probe passes when its status is in ok_statuses and every expected
+        marker is in the body; a passing probe with a record template is
+        stored in the results under name. Failed requests are recorded as
+        errors and return None. Output goes to log, the calling test's section.
+        Results report endpoint, the base URL, when url has a query baked in.
+        """
+        label = label or name
+        endpoint = endpoint or url
+        try:
+            status, content_type, body = await self._fetch(url, method, max_bytes, params, headers)
+        except _PROBE_ERRORS as e:
+            log.error("✗ %s error: %s", label, type(e).__name__)
+            self._record_error(name, endpoint, e)
+            return None
+        
+        log.info("%s: Status %s", label, status)
+        if record is not None and status in ok_statuses and all(marker in body for marker in expect_markers):
+            log.info("✓ %s %s", label, record['status'])
+            self.results[name] = {**record, 'endpoint': endpoint, 'http_status': status}
+        return status, content_type, body
 
     async def test_patentsview_new_api(self):
         """Test the new PatentsView Search API v2 (2024-2025)"""
-        print("\n1. Testing PatentsView Search API v2 (New 2024-2025)...")
+        log = _Section(logger, {'section': 'PatentsView'})
         
-        try:
-            # Try the new PatentsView Search API
-            connector = aiohttp.TCPConnector(ssl=self.ssl_context)
-            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                
-                # Test basic search endpoint
-                search_url = "https://search.patentsview.org/api/v1/patent/"
-                params = {
-                    "q": json.dumps({
-                        "patent_title": "artificial intelligence"
-                    }),
-                    "f": json.dumps([
-                        "patent_id", "patent_title", "patent_date", 
-                        "inventor_name", "assignee_organization"
-                    ]),
-                    "s": json.dumps([{"patent_date": "desc"}]),
-                    "o": json.dumps({"per_page": 3})
-                }
-                
-                async with session.get(search_url, params=params, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    print(f"   Status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('patents'):
-                            print(f"   ✓ SUCCESS! Found {len(data['patents'])} patents")
-                            for patent in data['patents'][:2]:
-                                print(f"     - {patent.get('patent_id', 'N/A')}: {patent.get('patent_title', 'No title')[:50]}...")
-                            self.results['patentsview_v2'] = {
-                                'status': 'working',
-                                'endpoint': search_url,
-                                'sample_data': data['patents'][:2]
-                            }
-                        else:
-                            print("   ⚠ No patents found")
-                    else:
-                        text = await response.text()
-                        print(f"   ✗ Failed with response: {text[:200]}...")
-                        
-        except Exception as e:
-            print(f"   ✗ Error: {str(e)[:100]}...")
+        # Try the new PatentsView Search API, then the legacy one if it can't be reached
+        candidates = (
+            ('patentsview_v2', 'PatentsView v2', _PV_V2_URL, _PV_V2_QUERY),
+            ('patentsview_legacy', 'PatentsView legacy', _PV_LEGACY_URL, _PV_LEGACY_QUERY)
+        )
+        for name, label, url, query in candidates:
+            response = await self._probe(log, name, query, label=label, endpoint=url)
+            if response is None:
+                continue
+            
+            status, _, body = response
+            if status != 200:
+                log.error("✗ %s failed with response: %s...", label, body[:200].decode(errors='replace'))
+                return
             
-            # Try alternative endpoint
             try:
-                alt_url = "https://api.patentsview.org/patents/query"
-                params = {
-                    "q": '{"_text_any":{"patent_title":"machine learning"}}',
-                    "f": '["patent_number","patent_title","patent_date"]',
-                    "o": '{"per_page":3}'
+                patents = orjson.loads(body).get('patents')
+            except orjson.JSONDecodeError as e:
+                log.error("✗ %s error: %s", label, type(e).__name__)
+                self._record_error(name, url, e)
+                continue
+            
+            if patents:
+                log.info("✓ SUCCESS! Found %s patents", len(patents))
+                for patent in patents:
+                    log.info("  - %s", patent.get('patent_id', patent.get('patent_number', 'N/A')))
+                self.results[name] = {
+                    'status': 'working',
+                    'endpoint': url,
+                    'sample_data': patents
                 }
-                
-                async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                    async with session.get(alt_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        print(f"   Fallback API Status: {response.status}")
-                        if response.status == 200:
-                            data = await response.json()
-                            if data.get('patents'):
-                                print(f"   ✓ Fallback SUCCESS! Found {len(data['patents'])} patents")
-                                self.results['patentsview_legacy'] = {
-                                    'status': 'working',
-                                    'endpoint': alt_url,
-                                    'sample_data': data['patents'][:2]
-                                }
-            except Exception as fallback_error:
-                print(f"   ✗ Fallback also failed: {str(fallback_error)[:50]}...")
+            else:
+                log.info("⚠ No patents found")
+            return
 
     async def test_uspto_open_data_portal(self):
         """Test USPTO Open Data Portal APIs"""
-        print("\n2. Testing USPTO Open Data Portal (ODP) APIs...")
+        log = _Section(logger, {'section': 'Open Data Portal'})
         
-        connector = aiohttp.TCPConnector(ssl=self.ssl_context)
+        # Test the API endpoints all at once, then check them in order
+        responses = await asyncio.gather(*(
+            self._probe(log, name.lower().replace(' ', '_'), api_url, label=name)
+            for name, api_url in self._ENDPOINTS_ODP
+        ))
         
-        # Test various ODP endpoints
-        endpoints_to_test = [
-            {
-                'name': 'PTAB API v2',
-                'url': 'https://developer.uspto.gov/ptab-api/swagger-ui/index.html',
-                'api_url': 'https://api.uspto.gov/ptab/v2/search'
-            },
-            {
-                'name': 'Patent Assignment API',
-                'url': 'https://assignment-api.uspto.gov/patent/swaggerui/index.html',
-                'api_url': 'https://assignment-api.uspto.gov/patent/search'
-            },
-            {
-                'name': 'TSDR Data API',
-                'url': 'https://developer.uspto.gov/api-catalog/tsdr-data-api',
-                'api_url': 'https://tsdrapi.uspto.gov/ts/cd/casestatus/sn79218695/info.json'
+        for (name, api_url), response in zip(self._ENDPOINTS_ODP, responses):
+            if response is None or response[0] != 200:
+                continue
+            
+            status, content_type, body = response
+            if 'json' not in content_type:
+                log.info("✓ %s responded with %s bytes", name, len(body))
+                continue
+            
+            key = name.lower().replace(' ', '_')
+            try:
+                orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                log.error("✗ %s error: %s", name, type(e).__name__)
+                self._record_error(key, api_url, e)
+                continue
+            
+            log.info("✓ %s: JSON response received", name)
+            self.results[key] = {
+                'status': 'working',
+                'endpoint': api_url,
+                'content_type': content_type
             }
-        ]
-        
-        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-            for endpoint in endpoints_to_test:
-                try:
-                    print(f"   Testing {endpoint['name']}...")
-                    
-                    # Test the API endpoint
-                    async with session.get(endpoint['api_url'], timeout=aiohttp.ClientTimeout(total=10)) as response:
-                        print(f"     Status: {response.status}")
-                        if response.status == 200:
-                            content_type = response.headers.get('content-type', '')
-                            if 'json' in content_type:
-                                data = await response.json()
-                                print(f"     ✓ SUCCESS! JSON response received")
-                                self.results[endpoint['name'].lower().replace(' ', '_')] = {
-                                    'status': 'working',
-                                    'endpoint': endpoint['api_url'],
-                                    'content_type': content_type
-                                }
-                            else:
-                                text = await response.text()
-                                print(f"     ✓ SUCCESS! Response length: {len(text)} characters")
-                                
-                except Exception as e:
-                    print(f"     ✗ Error: {str(e)[:50]}...")
 
     async def test_patent_public_search(self):
         """Test USPTO Patent Public Search interface"""
-        print("\n3. Testing USPTO Patent Public Search...")
+        log = _Section(logger, {'section': 'Patent Public Search'})
         
-        try:
-            connector = aiohttp.TCPConnector(ssl=self.ssl_context)
-            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                
-                # Test main Patent Public Search page
-                url = "https://ppubs.uspto.gov/pubwebapp/"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    print(f"   Status: {response.status}")
-                    if response.status == 200:
-                        text = await response.text()
-                        if "Patent Public Search" in text:
-                            print("   ✓ SUCCESS! Patent Public Search is accessible")
-                            
-                            # Try to find API endpoints in the page
-                            if "api/" in text or "search/v1" in text:
-                                print("   ✓ Potential API endpoints found in page")
-                            
-                            self.results['patent_public_search'] = {
-                                'status': 'accessible',
-                                'endpoint': url,
-                                'note': 'Web interface accessible, may have hidden APIs'
-                            }
-                        
-                # Try potential API endpoints
-                api_endpoints = [
-                    "https://ppubs.uspto.gov/pubwebapp/api/search",
-                    "https://ppubs.uspto.gov/dirsearch-public/patents/searchpost",
-                    "https://ppubs.uspto.gov/dirsearch-public/searches"
-                ]
-                
-                for api_url in api_endpoints:
-                    try:
-                        async with session.get(api_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                            print(f"   API endpoint {api_url}: Status {response.status}")
-                            if response.status in [200, 400, 405]:  # 400/405 might indicate endpoint exists but needs proper params
-                                print(f"   ✓ Potential API endpoint found!")
-                                self.results[f'patent_search_api_{len(self.results)}'] = {
-                                    'status': 'potential',
-                                    'endpoint': api_url,
-                                    'http_status': response.status
-                                }
-                    except:
-                        pass
-                        
-        except Exception as e:
-            print(f"   ✗ Error: {str(e)[:100]}...")
+        # Main Patent Public Search page
+        url = "https://ppubs.uspto.gov/pubwebapp/"
+        
+        # Potential API endpoints
+        api_endpoints = [
+            "https://ppubs.uspto.gov/pubwebapp/api/search",
+            "https://ppubs.uspto.gov/dirsearch-public/patents/searchpost",
+            "https://ppubs.uspto.gov/dirsearch-public/searches"
+        ]
+        
+        page, *_ = await asyncio.gather(
+            self._probe(log, 'patent_public_search', url, label='Patent Public Search',
+                        expect_markers=(b"Patent Public Search",),
+                        record={'status': 'accessible', 'note': 'Web interface accessible, may have hidden APIs'}),
+            # 400/405 might indicate endpoint exists but needs proper params
+            *(self._probe(log, f'patent_search_api_{i}', api_url, label=api_url, method='HEAD',
+                          ok_statuses=(200, 400, 405), record={'status': 'potential'})
+              for i, api_url in enumerate(api_endpoints, 1))
+        )
+        
+        # Try to find API endpoints in the page
+        if self.results.get('patent_public_search', {}).get('status') == 'accessible':
+            body = page[2]
+            if b"api/" in body or b"search/v1" in body:
+                log.info("✓ Potential API endpoints found in page")
 
     async def test_bulk_data_access(self):
         """Test USPTO Bulk Data downloads"""
-        print("\n4. Testing USPTO Bulk Data Access...")
+        log = _Section(logger, {'section': 'Bulk Data'})
         
-        try:
-            connector = aiohttp.TCPConnector(ssl=self.ssl_context)
-            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                
-                # Test bulk data portal
-                bulk_urls = [
-                    "https://data.uspto.gov/",
-                    "https://data.uspto.gov/bulkdata",
-                    "https://bulkdata.uspto.gov/"
-                ]
-                
-                for url in bulk_urls:
-                    try:
-                        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                            print(f"   {url}: Status {response.status}")
-                            if response.status == 200:
-                                text = await response.text()
-                                if any(term in text.lower() for term in ['bulk', 'xml', 'json', 'download']):
-                                    print(f"   ✓ SUCCESS! Bulk data portal accessible")
-                                    self.results['bulk_data_portal'] = {
-                                        'status': 'working',
-                                        'endpoint': url,
-                                        'note': 'Bulk data downloads available'
-                                    }
-                                    break
-                    except Exception as e:
-                        print(f"   ✗ {url} failed: {str(e)[:30]}...")
-                        
-        except Exception as e:
-            print(f"   ✗ Error: {str(e)[:50]}...")
+        # Test bulk data portal
+        bulk_urls = [
+            "https://data.uspto.gov/",
+            "https://data.uspto.gov/bulkdata",
+            "https://bulkdata.uspto.gov/"
+        ]
+        
+        # Fetch the first 16KB of every candidate at once; the first in list order
+        # that looks like a portal wins. Servers that ignore Range are cut off anyway
+        responses = await asyncio.gather(*(
+            self._probe(log, 'bulk_data_portal', url, label=url, headers={'Range': 'bytes=0-16383'}, max_bytes=16384)
+            for url in bulk_urls
+        ))
+        
+        for url, response in zip(bulk_urls, responses):
+            if response and response[0] in (200, 206) and _BULK_RE.search(response[2]):
+                log.info("✓ SUCCESS! Bulk data portal accessible at %s", url)
+                self.results['bulk_data_portal'] = {
+                    'status': 'working',
+                    'endpoint': url,
+                    'note': 'Bulk data downloads available'
+                }
+                break
 
     async def test_alternative_apis(self):
         """Test alternative patent APIs"""
-        print("\n5. Testing Alternative Patent APIs...")
-        
-        connector = aiohttp.TCPConnector(ssl=self.ssl_context)
-        
-        # Google Patents Public Datasets
-        try:
-            print("   Testing Google Patents...")
-            # Google doesn't have a direct API, but has public datasets
-            # We can test if we can access Google Patents pages
-            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                google_url = "https://patents.google.com/"
-                async with session.get(google_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        print("   ✓ Google Patents accessible (no direct API, but web scraping possible)")
-                        self.results['google_patents'] = {
-                            'status': 'web_accessible',
-                            'endpoint': google_url,
-                            'note': 'Web scraping possible, no direct API'
-                        }
-        except Exception as e:
-            print(f"   ✗ Google Patents error: {str(e)[:50]}...")
+        log = _Section(logger, {'section': 'Alternative APIs'})
         
-        # European Patent Office OPS
-        try:
-            print("   Testing EPO OPS API...")
-            async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
-                epo_url = "https://ops.epo.org/3.2/rest-services/published-data/search/biblio"
-                params = {"q": "artificial intelligence"}
-                async with session.get(epo_url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    print(f"   EPO OPS Status: {response.status}")
-                    if response.status in [200, 400, 401]:  # 401 might mean auth required
-                        print("   ✓ EPO OPS API endpoint responsive")
-                        self.results['epo_ops'] = {
-                            'status': 'responsive',
-                            'endpoint': epo_url,
-                            'note': 'May require authentication'
-                        }
-        except Exception as e:
-            print(f"   ✗ EPO OPS error: {str(e)[:50]}...")
+        await asyncio.gather(
+            # Google doesn't have a direct API, but we can test if its pages are reachable
+            self._probe(log, 'google_patents', "https://patents.google.com/", label='Google Patents', method='HEAD',
+                        record={'status': 'web_accessible', 'note': 'Web scraping possible, no direct API'}),
+            # European Patent Office OPS; 401 might mean auth required. Only the
+            # status matters, so the search body is never downloaded
+            self._probe(log, 'epo_ops', _EPO_OPS_QUERY, label='EPO OPS', max_bytes=0, ok_statuses=(200, 400, 401),
+                        record={'status': 'responsive', 'note': 'May require authentication'}, endpoint=_EPO_OPS_URL)
+        )
 
     def test_sync_requests(self):
         """Test synchronous requests with requests library"""
-        print("\n6. Testing with synchronous requests (bypassing SSL)...")
+        log = _Section(logger, {'section': 'Sync Requests'})
         
-        # Configure requests to ignore SSL
-        session = requests.Session()
-        session.verify = False
-        session.headers.update(self.headers)
+        session = self._sync_session
         
-        # Test PatentsView with sync requests
-        try:
-            print("   Testing PatentsView (sync)...")
-            url = "https://api.patentsview.org/patents/query"
-            params = {
-                "q": '{"_text_any":{"patent_title":"blockchain"}}',
-                "f": '["patent_number","patent_title","patent_date"]',
-                "o": '{"per_page":2}'
-            }
-            
-            response = session.get(url, params=params, timeout=15)
-            print(f"   Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('patents'):
-                    print(f"   ✓ SUCCESS! Found {len(data['patents'])} patents")
-                    for patent in data['patents']:
-                        print(f"     - {patent['patent_number']}: {patent['patent_title'][:40]}...")
-                    self.results['patentsview_sync'] = {
-                        'status': 'working',
-                        'endpoint': url,
-                        'method': 'synchronous',
-                        'sample_data': data['patents']
-                    }
+        # The hosts are independent, so their round trips overlap on worker
+        # threads sharing the pooled session; results are checked as they land
+        with ThreadPoolExecutor(max_workers=len(self._ENDPOINTS_SYNC)) as executor:
+            futures = {}
+            for name, url in self._ENDPOINTS_SYNC:
+                log.info("Testing %s (sync)...", name)
+                futures[executor.submit(session.get, url, timeout=self.SYNC_TIMEOUT)] = (name, url)
             
-        except Exception as e:
-            print(f"   ✗ Sync PatentsView error: {str(e)[:50]}...")
-        
-        # Test other endpoints synchronously
-        test_urls = [
-            ("USPTO Developer Portal", "https://developer.uspto.gov/"),
-            ("TSDR API", "https://tsdrapi.uspto.gov/ts/cd/casestatus/sn88123456/info.xml"),
-            ("Patent Assignment", "https://assignment-api.uspto.gov/patent/search?query=artificial")
-        ]
-        
-        for name, url in test_urls:
-            try:
-                print(f"   Testing {name} (sync)...")
-                response = session.get(url, timeout=10)
-                print(f"   {name} Status: {response.status_code}")
+            for future in as_completed(futures):
+                name, url = futures[future]
+                key = f'{name.lower().replace(" ", "_")}_sync'
+                try:
+                    response = future.result()
+                except _PROBE_ERRORS as e:
+                    log.error("✗ %s error: %s", name, type(e).__name__)
+                    self._record_error(key, url, e)
+                    continue
+                
+                log.info("%s Status: %s", name, response.status_code)
                 if response.status_code == 200:
-                    print(f"   ✓ {name} accessible!")
-                    self.results[f'{name.lower().replace(" ", "_")}_sync'] = {
+                    log.info("✓ %s accessible!", name)
+                    self.results[key] = {
                         'status': 'accessible',
                         'endpoint': url,
                         'method': 'synchronous'
                     }
-            except Exception as e:
-                print(f"   ✗ {name} error: {str(e)[:30]}...")
 
     async def run_all_tests(self):
         """Run all tests"""
-        print("=" * 80)
-        print("USPTO API Comprehensive Testing - 2025 Edition")
-        print("=" * 80)
+        logger.info("=" * 80)
+        logger.info("USPTO API Comprehensive Testing - 2025 Edition")
+        logger.info("=" * 80)
+        
+        # The probes are independent, so run them side by side; the blocking
+        # requests test gets a worker thread so it never stalls the loop
+        async_tasks = [
+            asyncio.create_task(self.test_patentsview_new_api()),
+            asyncio.create_task(self.test_uspto_open_data_portal()),
+            asyncio.create_task(self.test_patent_public_search()),
+            asyncio.create_task(self.test_bulk_data_access()),
+            asyncio.create_task(self.test_alternative_apis())
+        ]
+        sync_task = asyncio.create_task(asyncio.to_thread(self.test_sync_requests))
+        try:
+            # Each test records its own results as soon as it finishes
+            for finished in asyncio.as_completed([*async_tasks, sync_task], timeout=self.RUN_TIMEOUT):
+                await finished
+        except TimeoutError:
+            logger.warning("\n⚠ Testing stopped after %ss, reporting what was found so far", self.RUN_TIMEOUT)
+        finally:
+            # Let cancelled tests unwind while the client and cache are still open
+            for task in async_tasks:
+                task.cancel()
+            await asyncio.gather(*async_tasks, return_exceptions=True)
+            # A worker thread can't be cancelled, and its requests are already
+            # bounded by SYNC_TIMEOUT, so let it finish before the results are
+            # reported and its session is closed
+            if not sync_task.done():
+                logger.info("Waiting for the synchronous requests to finish...")
+            await asyncio.gather(sync_task, return_exceptions=True)
         
-        await self.test_patentsview_new_api()
-        await self.test_uspto_open_data_portal()
-        await self.test_patent_public_search()
-        await self.test_bulk_data_access()
-        await self.test_alternative_apis()
-        self.test_sync_requests()
+        logger.info("\n" + "=" * 80)
+        logger.info("SUMMARY OF WORKING ENDPOINTS")
+        logger.info("=" * 80)
         
-        print("\n" + "=" * 80)
-        print("SUMMARY OF WORKING ENDPOINTS")
-        print("=" * 80)
+        working = {name: info for name, info in self.results.items() if info['status'] != 'error'}
+        errors = {name: info for name, info in self.results.items() if info['status'] == 'error'}
         
-        if self.results:
-            for name, info in self.results.items():
+        if working:
+            for name, info in working.items():
                 status = info['status']
                 endpoint = info['endpoint']
-                print(f"✓ {name.upper()}")
-                print(f"  Status: {status}")
-                print(f"  Endpoint: {endpoint}")
+                logger.info("✓ %s", name.upper())
+                logger.info("  Status: %s", status)
+                logger.info("  Endpoint: %s", endpoint)
                 if 'note' in info:
-                    print(f"  Note: {info['note']}")
+                    logger.info("  Note: %s", info['note'])
                 if 'sample_data' in info:
-                    print(f"  Sample data available: {len(info['sample_data'])} items")
-                print()
+                    logger.info("  Sample data available: %s items", len(info['sample_data']))
+                logger.info("")
         else:
-            print("❌ No working endpoints found")
+            logger.info("❌ No working endpoints found")
         
-        print("=" * 80)
-        print(f"Testing completed. Found {len(self.results)} working/accessible endpoints.")
+        if errors:
+            logger.info("Failed probes:")
+            for name, info in errors.items():
+                logger.error("✗ %s: %s (%s)", name.upper(), info['error'], info['endpoint'])
+        
+        logger.info("=" * 80)
+        logger.info("Testing completed. Found %s working/accessible endpoints.", len(working))
         return self.results
 
 async def main():
-    tester = USPTOAPITester()
-    results = await tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Test USPTO APIs and alternative patent data sources")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and don't update the on-disk probe cache")
+    args = parser.parse_args()
+    
+    async with USPTOAPITester(use_cache=not args.no_cache) as tester:
+        try:
+            results = await tester.run_all_tests()
+        except Exception as e:
+            # A probe hit something other than a network failure; keep what was collected
+            logger.error("\n✗ Testing aborted: %r", e)
+            results = tester.results
     
     # Save results to file
-    with open('uspto_api_test_results.json', 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    with open('uspto_api_test_results.json', 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
     
-    print(f"\nResults saved to uspto_api_test_results.json")
+    logger.info("\nResults saved to uspto_api_test_results.json")
     return results
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        # uvloop is optional (and not available on Windows); without it the stock loop is used
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    
+    listener = start_logging()
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
+    finally:
+        listener.stop()